@@ -28,23 +28,29 @@ bl_info = {
     "wiki_url": "https://github.com/agitoreiken/SKkeeper",
 }
 
+from functools import partial
+
 import bpy
+import numpy as np
 from bpy.types import Operator, PropertyGroup
 from bpy.props import BoolProperty, CollectionProperty
 
 
-def copy_object(obj, times=1, offset=0):
+def copy_object(obj, times=1, offset=0, copy_data=True, collection=None):
+    """copies the given object, copy_data=False keeps the copies on the source data"""
     # TODO: maybe get the collection of the source and link the object to
     # that collection instead of the scene main collection
 
     objects = []
+    collection_objects = (collection or bpy.context.collection).objects
     for i in range(0, times):
         copy_obj = obj.copy()
-        copy_obj.data = obj.data.copy()
+        if copy_data:
+            copy_obj.data = obj.data.copy()
         copy_obj.name = obj.name + "_shapekey_" + str(i + 1)
         copy_obj.location.x += offset * (i + 1)
 
-        bpy.context.collection.objects.link(copy_obj)
+        collection_objects.link(copy_obj)
         objects.append(copy_obj)
 
     return objects
@@ -77,53 +83,59 @@ def apply_shapekey(obj, sk_keep):
     shapekeys = obj.data.shape_keys.key_blocks
 
     # check for valid index
-    if sk_keep < 0 or sk_keep > len(shapekeys):
+    if sk_keep < 0 or sk_keep >= len(shapekeys):
         return
 
-    # remove all other shapekeys
-    for i in reversed(range(0, len(shapekeys))):
-        if i != sk_keep:
-            obj.shape_key_remove(shapekeys[i])
-
-    # remove the chosen one and bake it into the object
-    obj.shape_key_remove(shapekeys[0])
+    # read the chosen one, remove all shapekeys at once and bake it into the object
+    coords = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    shapekeys[sk_keep].data.foreach_get("co", coords)
+    obj.shape_key_clear()
+    obj.data.vertices.foreach_set("co", coords)
+    obj.data.update()
 
 
 def apply_modifiers(self, obj):
     """applies all modifiers in order"""
     # now uses object.convert to circumvent errors with disabled modifiers
 
-    modifiers = obj.modifiers
-    for modifier in modifiers:
-        if modifier.type == "SUBSURF":
-            modifier.show_only_control_edges = False
-
-    for o in bpy.context.scene.objects:
-        o.select_set(False)
-
-    obj.select_set(True)
-    bpy.context.view_layer.objects.active = obj
-
     # bpy.ops.object.convert(target="MESH")
 
-    for mod in modifiers:
-        if mod.type != "ARMATURE":
+    # pass the object explicitly instead of relying on the scene selection,
+    # armature-only stacks fall through without any operator call
+    with bpy.context.temp_override(
+        object=obj,
+        active_object=obj,
+        selected_objects=[obj],
+        selected_editable_objects=[obj],
+    ):
+        # iterate a snapshot, applying a modifier removes it from the stack
+        for mod in list(obj.modifiers):
+            if mod.type == "ARMATURE":
+                continue
+            if mod.type == "SUBSURF" and mod.show_only_control_edges:
+                mod.show_only_control_edges = False
+
+            mod_name, mod_type = mod.name, mod.type
             try:
-                bpy.ops.object.modifier_apply(modifier=mod.name)
+                bpy.ops.object.modifier_apply(modifier=mod_name)
             except:
                 self.report(
                     {"INFO"},
-                    f"Removed invalid modifier {mod.name} ({mod.type}) from {obj.name}",
+                    f"Removed invalid modifier {mod_name} ({mod_type}) from {obj.name}",
                 )
-                bpy.ops.object.modifier_remove(modifier=mod.name)
+                bpy.ops.object.modifier_remove(modifier=mod_name)
 
 
 def reset_pose(obj):
+    """clears the pose transforms of all bones of the armature"""
+    # pose.transforms_clear would need the armature in pose mode, so the
+    # transforms are reset through the data api instead
     for bone in obj.pose.bones:
         bone.location = (0.0, 0.0, 0.0)
         bone.rotation_quaternion = (1.0, 0.0, 0.0, 0.0)
         bone.rotation_euler = (0.0, 0.0, 0.0)
-        bone.rotation_euler = (1.0, 1.0, 1.0)
+        bone.rotation_axis_angle = (0.0, 0.0, 1.0, 0.0)
+        bone.scale = (1.0, 1.0, 1.0)
 
 
 def remove_modifiers(obj):
@@ -134,20 +146,78 @@ def remove_modifiers(obj):
         obj.modifiers.remove(modifier)
 
 
-def add_objs_shapekeys(destination, sources):
-    """takes an array of objects and adds them as shapekeys to the destination object"""
-    for o in bpy.context.scene.objects:
-        o.select_set(False)
-
-    for src in sources:
-        src.select_set(True)
-
-    bpy.context.view_layer.objects.active = destination
-    bpy.ops.object.join_shapes()
+def property_getter(id_data, data_path):
+    """returns a function reading the property at data_path without parsing the path again"""
+    owner_path, _, name = data_path.rpartition(".")
+    if not name.isidentifier():
+        return partial(id_data.path_resolve, data_path)
+    owner = id_data.path_resolve(owner_path) if owner_path else id_data
+    return partial(getattr, owner, name)
+
+
+def insert_keyframes(id_data, data_path, index, frames, values):
+    """keyframes the property at all given frames at once, replacing existing keyframes on those frames"""
+    animation_data = id_data.animation_data or id_data.animation_data_create()
+    if animation_data.action is None:
+        animation_data.action = bpy.data.actions.new(name=f"{id_data.name}Action")
+
+    fcurves = animation_data.action.fcurves
+    fcurve = fcurves.find(data_path, index=index) or fcurves.new(data_path, index=index)
+    keyframe_points = fcurve.keyframe_points
+
+    # like keyframe_insert, replace keyframes sitting on a baked frame and keep
+    # subframe keyframes, removing from the back keeps the indices valid
+    co = np.empty(len(keyframe_points) * 2, dtype=np.float32)
+    keyframe_points.foreach_get("co", co)
+    x = co[0::2]
+    on_frame = np.abs(x - np.rint(x)) < 0.01
+    replaced = np.flatnonzero(on_frame & np.isin(np.rint(x), frames))
+    for i in reversed(replaced):
+        keyframe_points.remove(keyframe_points[int(i)], fast=True)
+
+    num_kept = len(keyframe_points)
+    keyframe_points.add(len(frames))
+    co = np.empty(len(keyframe_points) * 2, dtype=np.float32)
+    keyframe_points.foreach_get("co", co)
+    co[num_kept * 2 :: 2] = frames
+    co[num_kept * 2 + 1 :: 2] = values
+    keyframe_points.foreach_set("co", co)
+
+    # keyframe_points.add always creates bezier keyframes, use the interpolation
+    # and handle type the user set for new keyframes instead
+    edit = bpy.context.preferences.edit
+    keyframe_props = bpy.types.Keyframe.bl_rna.properties
+    for name, item in (
+        ("interpolation", edit.keyframe_new_interpolation_type),
+        ("handle_left_type", edit.keyframe_new_handle_type),
+        ("handle_right_type", edit.keyframe_new_handle_type),
+    ):
+        enum_values = np.empty(len(keyframe_points), dtype=np.int32)
+        keyframe_points.foreach_get(name, enum_values)
+        enum_values[num_kept:] = keyframe_props[name].enum_items[item].value
+        keyframe_points.foreach_set(name, enum_values)
+
+    # sorts the keyframes and recalculates their handles
+    fcurve.update()
+
+
+def copy_properties(source, destination, names):
+    """copies the named properties from source to destination, in the given order"""
+    for name in names:
+        setattr(destination, name, getattr(source, name))
+
+
+def selected_meshes(context, require_sk=False):
+    """returns the selected mesh objects, optionally only those with shapekeys"""
+    return [
+        obj
+        for obj in context.selected_objects
+        if obj.type == "MESH" and (not require_sk or obj.data.shape_keys is not None)
+    ]
 
 
 def reset_armature_pose(objects):
-    processed_armature = []
+    processed_armatures = set()
     for obj in objects:
         armature = next(
             (
@@ -157,9 +227,32 @@ def reset_armature_pose(objects):
             ),
             None,
         )
-        if armature and armature.object not in processed_armature:
-            reset_pose(armature.object)
-            processed_armature.append(armature)
+        if armature is None:
+            continue
+
+        # reset every armature once, even when it deforms several meshes
+        key = armature.object.as_pointer()
+        if key in processed_armatures:
+            continue
+        processed_armatures.add(key)
+        reset_pose(armature.object)
+
+
+# driver properties copied onto the receiver, in order:
+# the variable type has to be set before its targets are copied
+DRIVER_ATTRS = ("type", "expression", "use_self")
+DRIVER_VARIABLE_ATTRS = ("name", "type")
+DRIVER_TARGET_ATTRS = (
+    "id",
+    "data_path",
+    "bone_target",
+    "transform_space",
+    "transform_type",
+)
+
+# nla properties copied onto the receiver, frame ranges are set by strips.new
+NLA_TRACK_ATTRS = ("name", "is_solo", "mute")
+NLA_STRIP_ATTRS = ("blend_in", "blend_out", "use_auto_blend", "extrapolation")
 
 
 class SK_OT_apply_mods(Operator):
@@ -196,7 +289,7 @@ class SK_OT_apply_mods(Operator):
         return True
 
     def execute(self, context):
-        self.objects = [obj for obj in context.selected_objects if obj.type == "MESH"]
+        self.objects = selected_meshes(context)
         if not self.validate_input():
             return {"CANCELLED"}
 
@@ -211,110 +304,186 @@ class SK_OT_apply_mods(Operator):
         return {"FINISHED"}
 
     def apply_all_modifiers_with_sk(self, context):
-        for obj in self.objects:
-            if obj.data.shape_keys is None:
-                apply_modifiers(self, obj)
-                continue
+        bpy.ops.object.select_all(action="DESELECT")
 
-            # create receiving object that will contain all collapsed shapekeys
-            receiver = copy_object(obj, times=1, offset=0)[0]
-            receiver.name = "sk_receiver"
-            apply_shapekey(receiver, 0)
-            apply_modifiers(self, receiver)
-
-            for i in range(1, len(obj.data.shape_keys.key_blocks)):
-                obj_sk = obj.data.shape_keys.key_blocks[i]
-                # copy of baseobject / blendshape donor
-                blendshape = copy_object(obj, times=1, offset=0)[0]
-                apply_shapekey(blendshape, i)
-                apply_modifiers(self, blendshape)
-
-                # add the copy as a blendshape to the receiver
-                add_objs_shapekeys(receiver, [blendshape])
-
-                # restore the shapekey name
-                sk = receiver.data.shape_keys.key_blocks[i]
-                sk.name = obj_sk.name
-                sk.mute = obj_sk.mute
-                sk.slider_min = obj_sk.slider_min
-                sk.slider_max = obj_sk.slider_max
-                sk.value = obj_sk.value
-                sk.interpolation = obj_sk.interpolation
-                sk.lock_shape = obj_sk.lock_shape
-                sk.vertex_group = obj_sk.vertex_group
-                # delete the blendshape donor and its mesh datablock (save memory)
-                mesh_data = blendshape.data
-                bpy.data.objects.remove(blendshape)
-                bpy.data.meshes.remove(mesh_data)
-
-            # rename id, copy action, drivers, nla tracks
-            # proper sk.id_data name, applied after object has been deleted to avoid .000 postfix
-            skid_name = f"{obj.name}.SK"
-
-            obj_skid = obj.data.shape_keys.key_blocks[0].id_data
-            skid = receiver.data.shape_keys.key_blocks[0].id_data
-            obj_skid.animation_data_create()
-            skid.animation_data_create()
-
-            # copy action
-            if obj_skid.animation_data.action:
-                skid.animation_data.action = obj_skid.animation_data.action.copy()
-
-            # copy drivers
-            if obj_skid.animation_data.drivers:
-                for driver in obj_skid.animation_data.drivers:
-                    new_driver = skid.driver_add(driver.data_path)
-                    new_driver.driver.type = driver.driver.type
-                    new_driver.mute = driver.mute
-                    new_driver.driver.expression = driver.driver.expression
-                    new_driver.driver.use_self = driver.driver.use_self
-
-                    # Copy all variables of the driver
-                    for var in driver.driver.variables:
-                        new_var = new_driver.driver.variables.new()
-                        new_var.name = var.name
-                        new_var.type = var.type
-
-                        # Copy targets
-                        for i, target in enumerate(var.targets):
-                            new_var.targets[i].id = target.id
-                            new_var.targets[i].data_path = target.data_path
-                            new_var.targets[i].bone_target = target.bone_target
-                            new_var.targets[i].transform_space = target.transform_space
-                            new_var.targets[i].transform_type = target.transform_type
-
-            # copy nla tracks
-            if obj_skid.animation_data.nla_tracks:
-                for track in obj_skid.animation_data.nla_tracks:
-                    new_track = skid.animation_data.nla_tracks.new()
-                    new_track.name = track.name
-                    new_track.is_solo = track.is_solo
-                    new_track.mute = track.mute
-
-                    # Copy NLA strips
-                    for strip in track.strips:
-                        new_strip = new_track.strips.new(
-                            strip.name, int(strip.frame_start), strip.action
+        # scratch objects and originals are deleted together in one batch,
+        # removing them one by one remaps ID users for every removal
+        removed_ids = []
+        renames = []
+        # receiver of the object in progress, discarded if it does not finish
+        unfinished = None
+        try:
+            for obj in self.objects:
+                if obj.data.shape_keys is None:
+                    apply_modifiers(self, obj)
+                    continue
+
+                # armature modifiers are kept, with nothing else in the stack the
+                # object would be rebuilt unchanged
+                mod_types = {modifier.type for modifier in obj.modifiers}
+                if mod_types <= {"ARMATURE"}:
+                    continue
+
+                # create receiving object that will contain all collapsed shapekeys
+                receiver = copy_object(obj, times=1, offset=0)[0]
+                receiver.name = "sk_receiver"
+                unfinished = (receiver, receiver.data)
+                apply_shapekey(receiver, 0)
+
+                # scratch object that evaluates the modifier stack, its vertices are
+                # overwritten with each shapekey instead of copying the object per shapekey
+                # copying the receiver mesh before it gets its modifiers applied skips
+                # duplicating all shapekeys of the source mesh. It is linked next to the
+                # selected source, the active collection may be hidden or excluded and
+                # its objects would not be evaluated
+                scratch = copy_object(
+                    obj,
+                    times=1,
+                    offset=0,
+                    copy_data=False,
+                    collection=obj.users_collection[0],
+                )[0]
+                scratch.data = receiver.data.copy()
+                removed_ids.extend((scratch, scratch.data))
+                # armature modifiers are never applied, keep them out of the result
+                for modifier in scratch.modifiers:
+                    if modifier.type == "ARMATURE":
+                        modifier.show_viewport = False
+
+                apply_modifiers(self, receiver)
+
+                # evaluate the modifier stack of every shapekey through one shared
+                # depsgraph instead of applying it once per shapekey. All receiver
+                # shapekeys are added up front so the receiver is tagged once,
+                # filling them with foreach_set does not tag it again
+                depsgraph = context.evaluated_depsgraph_get()
+                if not scratch.evaluated_get(depsgraph).is_evaluated:
+                    self.report(
+                        {"WARNING"},
+                        f"Skipped {obj.name}: its modifiers are not evaluated, is its collection hidden or excluded?",
+                    )
+                    removed_ids.extend(unfinished)
+                    unfinished = None
+                    continue
+
+                key_blocks = obj.data.shape_keys.key_blocks
+                receiver.shape_key_add(name=key_blocks[0].name, from_mix=False)
+                receiver_sks = []
+                for obj_sk in key_blocks[1:]:
+                    sk = receiver.shape_key_add(name=obj_sk.name, from_mix=False)
+
+                    # restore the shapekey settings
+                    sk.mute = obj_sk.mute
+                    sk.slider_min = obj_sk.slider_min
+                    sk.slider_max = obj_sk.slider_max
+                    sk.value = obj_sk.value
+                    sk.interpolation = obj_sk.interpolation
+                    sk.lock_shape = obj_sk.lock_shape
+                    sk.vertex_group = obj_sk.vertex_group
+                    receiver_sks.append(sk)
+
+                num_verts = len(receiver.data.vertices)
+                coords = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+                # one buffer for the evaluated positions, reused for every shapekey
+                sk_coords = np.empty(num_verts * 3, dtype=np.float32)
+                # data paths of skipped shapekeys, their drivers are not copied
+                skipped_paths = set()
+                skipped_sks = []
+                for obj_sk, sk in zip(key_blocks[1:], receiver_sks):
+                    obj_sk.data.foreach_get("co", coords)
+                    scratch.data.vertices.foreach_set("co", coords)
+                    scratch.data.update()
+                    depsgraph.update()
+
+                    scratch_eval = scratch.evaluated_get(depsgraph)
+                    mesh = scratch_eval.to_mesh()
+                    matches = len(mesh.vertices) == num_verts
+                    if matches:
+                        # write the evaluated vertex positions into the receiver shapekey
+                        mesh.vertices.foreach_get("co", sk_coords)
+                        sk.data.foreach_set("co", sk_coords)
+                    scratch_eval.to_mesh_clear()
+
+                    if not matches:
+                        self.report(
+                            {"WARNING"},
+                            f"Skipped shapekey {obj_sk.name} of {obj.name}: vertex count changed after applying modifiers",
                         )
-                        # new_strip.action_frame_start = strip.action_frame_start
-                        # new_strip.action_frame_end = strip.action_frame_end
-                        new_strip.blend_in = strip.blend_in
-                        new_strip.blend_out = strip.blend_out
-                        new_strip.use_auto_blend = strip.use_auto_blend
-                        new_strip.extrapolation = strip.extrapolation
-                        # new_strip.frame_start = strip.frame_start
-                        # new_strip.frame_end = strip.frame_end
-
-            # delete the original and its mesh data
-            orig_name = obj.name
-            orig_data = obj.data
-            bpy.data.objects.remove(obj)
-            bpy.data.meshes.remove(orig_data)
-
-            skid.name = skid_name
-
-            # rename the receiver
-            receiver.name = orig_name
+                        skipped_paths.add(obj_sk.path_from_id())
+                        skipped_sks.append(sk)
+
+                # the scratch object is deleted with the batch, unlink it now so its
+                # evaluated mesh is not kept around while other objects are processed
+                for collection in scratch.users_collection:
+                    collection.objects.unlink(scratch)
+
+                for sk in skipped_sks:
+                    receiver.shape_key_remove(sk)
+                receiver.data.update()
+
+                # rename id, copy action, drivers, nla tracks
+                # proper sk.id_data name, applied after object has been deleted to avoid .000 postfix
+                skid_name = f"{obj.name}.SK"
+
+                obj_skid = obj.data.shape_keys.key_blocks[0].id_data
+                skid = receiver.data.shape_keys.key_blocks[0].id_data
+                obj_anim = obj_skid.animation_data
+                if obj_anim is not None:
+                    skid.animation_data_create()
+
+                # copy action
+                if obj_anim and obj_anim.action:
+                    skid.animation_data.action = obj_anim.action.copy()
+
+                # copy drivers
+                if obj_anim and obj_anim.drivers:
+                    for driver in obj_anim.drivers:
+                        # the path includes the closing bracket, so prefixes are exact
+                        if driver.data_path.startswith(tuple(skipped_paths)):
+                            continue
+                        new_driver = skid.driver_add(driver.data_path)
+                        new_driver.mute = driver.mute
+                        copy_properties(driver.driver, new_driver.driver, DRIVER_ATTRS)
+
+                        # Copy all variables of the driver
+                        for var in driver.driver.variables:
+                            new_var = new_driver.driver.variables.new()
+                            copy_properties(var, new_var, DRIVER_VARIABLE_ATTRS)
+
+                            # Copy targets
+                            for target, new_target in zip(var.targets, new_var.targets):
+                                copy_properties(target, new_target, DRIVER_TARGET_ATTRS)
+
+                # copy nla tracks
+                if obj_anim and obj_anim.nla_tracks:
+                    for track in obj_anim.nla_tracks:
+                        new_track = skid.animation_data.nla_tracks.new()
+                        copy_properties(track, new_track, NLA_TRACK_ATTRS)
+
+                        # Copy NLA strips
+                        new_strips = [
+                            new_track.strips.new(
+                                strip.name, int(strip.frame_start), strip.action
+                            )
+                            for strip in track.strips
+                        ]
+                        for strip, new_strip in zip(track.strips, new_strips):
+                            copy_properties(strip, new_strip, NLA_STRIP_ATTRS)
+
+                # delete the original and its mesh data, rename once it is gone
+                removed_ids.extend((obj, obj.data))
+                renames.append((receiver, obj.name, skid, skid_name))
+                unfinished = None
+        finally:
+            if unfinished is not None:
+                removed_ids.extend(unfinished)
+            bpy.data.batch_remove(removed_ids)
+
+            for receiver, orig_name, skid, skid_name in renames:
+                skid.name = skid_name
+
+                # rename the receiver
+                receiver.name = orig_name
 
     def apply_all_modifiers(self, context):
         self.next_selection = []
@@ -332,75 +501,57 @@ class SK_OT_apply_mods(Operator):
         return {"FINISHED"}
 
 
-BAKE_SHAPEKEY_ANIMATION_FRAME_START = None
-BAKE_SHAPEKEY_ANIMATION_FRAME_END = None
-BAKE_SHAPEKEY_ANIMATION_EXECUTE = False
+def clamp_frame(scene, frame):
+    """clamps the frame to the frame range of the scene"""
+    return max(scene.frame_start, min(frame, scene.frame_end))
 
 
-class SK_OT_bake_shapekey_animation(Operator):
-    """Bakes shapekey values into keyframes"""
+class SK_PG_bake_shapekey_animation(PropertyGroup):
+    """Frame range of the shapekey animation bake, stored per scene"""
 
-    bl_idname = "sk.bake_shapekey_animation"
-    bl_label = "Bake shapekey animation into keyframes"
-    bl_options = {"REGISTER", "UNDO"}
-    variable1 = 1
-    variable2: 23
-
-    def set_start_frame(self, value):
-        global BAKE_SHAPEKEY_ANIMATION_FRAME_START
-        scene = bpy.context.scene
-        BAKE_SHAPEKEY_ANIMATION_FRAME_START = max(
-            scene.frame_start, min(value, scene.frame_end)
-        )
+    def clamp_frame_range(self, start_frame, end_frame):
+        scene = self.id_data
+        start_frame = clamp_frame(scene, start_frame)
+        end_frame = clamp_frame(scene, end_frame)
+        # only assign on change, assigning triggers the update again
+        if start_frame != self.start_frame:
+            self.start_frame = start_frame
+        if end_frame != self.end_frame:
+            self.end_frame = end_frame
 
-    def set_end_frame(self, value):
-        global BAKE_SHAPEKEY_ANIMATION_FRAME_END
-        scene = bpy.context.scene
-        BAKE_SHAPEKEY_ANIMATION_FRAME_END = max(
-            scene.frame_start, min(value, scene.frame_end)
+    def update_start_frame(self, context):
+        # moving the start past the end drags the end along
+        self.clamp_frame_range(
+            self.start_frame, max(self.start_frame, self.end_frame)
         )
 
-    def get_start_frame(self):
-        global BAKE_SHAPEKEY_ANIMATION_FRAME_START
-        if BAKE_SHAPEKEY_ANIMATION_FRAME_START is None:
-            SK_OT_bake_shapekey_animation.set_start_frame(self, 0)
-        return BAKE_SHAPEKEY_ANIMATION_FRAME_START
-
-    def get_end_frame(self):
-        global BAKE_SHAPEKEY_ANIMATION_FRAME_END
-        if BAKE_SHAPEKEY_ANIMATION_FRAME_END is None:
-            SK_OT_bake_shapekey_animation.set_end_frame(self, 0)
-        return BAKE_SHAPEKEY_ANIMATION_FRAME_END
+    def update_end_frame(self, context):
+        # moving the end before the start drags the start along
+        self.clamp_frame_range(min(self.start_frame, self.end_frame), self.end_frame)
 
     start_frame: bpy.props.IntProperty(
         name="Start Frame",
         description="The starting frame of the range",
-        set=set_start_frame,
-        get=get_start_frame,
-    )
+        default=1,
+        update=update_start_frame,
+    )  # type: ignore
 
     end_frame: bpy.props.IntProperty(
         name="End Frame",
         description="The ending frame of the range",
-        set=set_end_frame,
-        get=get_end_frame,
-    )
+        default=250,
+        update=update_end_frame,
+    )  # type: ignore
 
-    def set_execute(self, value):
-        global BAKE_SHAPEKEY_ANIMATION_EXECUTE
-        BAKE_SHAPEKEY_ANIMATION_EXECUTE = value
 
-    def get_execute(self):
-        global BAKE_SHAPEKEY_ANIMATION_EXECUTE
-        return BAKE_SHAPEKEY_ANIMATION_EXECUTE
+class SK_OT_bake_shapekey_animation(Operator):
+    """Bakes shapekey values into keyframes"""
 
-    execute_ot: bpy.props.BoolProperty(
-        name="Execute",
-        description="Press to execute the operator",
-        default=False,
-        set=set_execute,
-        get=get_execute,
-    )
+    bl_idname = "sk.bake_shapekey_animation"
+    bl_label = "Bake shapekey animation into keyframes"
+    bl_options = {"REGISTER", "UNDO"}
+    variable1 = 1
+    variable2: 23
 
     def validate_input(self):
         # check for valid selection
@@ -412,27 +563,75 @@ class SK_OT_bake_shapekey_animation(Operator):
             return False
         return True
 
+    def invoke(self, context, event):
+        # show the range that will be baked, a stored range that lies outside
+        # the scene range would clamp to a single frame, use the whole scene then
+        scene = context.scene
+        settings = scene.sk_bake
+        if (
+            settings.end_frame < scene.frame_start
+            or settings.start_frame > scene.frame_end
+        ):
+            settings.clamp_frame_range(scene.frame_start, scene.frame_end)
+        else:
+            settings.clamp_frame_range(settings.start_frame, settings.end_frame)
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.sk_bake
+        layout.prop(settings, "start_frame")
+        layout.prop(settings, "end_frame")
+
     def execute(self, context):
-        if not self.execute_ot:
-            return {"FINISHED"}
-        self.report({"INFO"}, "Baked keyframes")
-        self.objects = [
-            obj
-            for obj in context.selected_objects
-            if obj.type == "MESH" and obj.data.shape_keys is not None
-        ]
+        self.objects = selected_meshes(context, require_sk=True)
         if not self.validate_input():
             return {"CANCELLED"}
 
         scene = context.scene
-        for frame in range(
-            BAKE_SHAPEKEY_ANIMATION_FRAME_START, BAKE_SHAPEKEY_ANIMATION_FRAME_END + 1
-        ):
-            scene.frame_set(frame)
-            for obj in self.objects:
-                for fcurve in obj.data.shape_keys.animation_data.drivers.values():
-                    obj.data.shape_keys.keyframe_insert(fcurve.data_path, frame=frame)
-        self.execute_ot = False
+        # the scene frame range may have changed since the range was set
+        frames = np.arange(
+            clamp_frame(scene, scene.sk_bake.start_frame),
+            clamp_frame(scene, scene.sk_bake.end_frame) + 1,
+            dtype=np.float32,
+        )
+        if frames.size == 0:
+            self.report({"WARNING"}, "Empty frame range, nothing baked")
+            return {"CANCELLED"}
+
+        # resolve every driven property once, the frame loop only reads values
+        bake_plan = {}
+        for obj in self.objects:
+            shape_keys = obj.data.shape_keys
+            if shape_keys.animation_data is None:
+                continue
+            for fcurve in shape_keys.animation_data.drivers:
+                key = (shape_keys, fcurve.data_path, fcurve.array_index)
+                if key not in bake_plan:
+                    bake_plan[key] = (
+                        property_getter(shape_keys, fcurve.data_path),
+                        fcurve.array_index,
+                        np.empty(len(frames), dtype=np.float32),
+                    )
+        samples = list(bake_plan.values())
+
+        # sample the driven values of every frame, keyframes are written afterwards.
+        # drivers can depend on anything animated, so each frame is evaluated once
+        # for all objects, nothing needs to be evaluated without drivers at all
+        if samples:
+            frame_current = scene.frame_current
+            for frame_index, frame in enumerate(frames):
+                scene.frame_set(int(frame))
+                for getter, index, values in samples:
+                    value = getter()
+                    if hasattr(value, "__len__"):
+                        value = value[index]
+                    values[frame_index] = value
+            scene.frame_set(frame_current)
+
+        for (shape_keys, data_path, index), (_, _, values) in bake_plan.items():
+            insert_keyframes(shape_keys, data_path, index, frames, values)
+        self.report({"INFO"}, "Baked keyframes")
         return {"FINISHED"}
 
 
@@ -464,11 +663,7 @@ class SK_OT_toggle_shapekeys_drivers(Operator):
         return True
 
     def execute(self, context):
-        self.objects = [
-            obj
-            for obj in context.selected_objects
-            if obj.type == "MESH" and obj.data.shape_keys is not None
-        ]
+        self.objects = selected_meshes(context, require_sk=True)
         if not self.validate_input():
             return {"CANCELLED"}
 
@@ -476,20 +671,28 @@ class SK_OT_toggle_shapekeys_drivers(Operator):
         num_toggled = 0
         num_toggled_obj = 0
         for obj in self.objects:
-            if obj.data.shape_keys.id_data.animation_data is None:
-                obj.data.shape_keys.id_data.animation_data_create()
+            # shapekeys without drivers are left alone, no animation data is created
+            animation_data = obj.data.shape_keys.id_data.animation_data
+            if animation_data is None or not animation_data.drivers:
+                continue
 
-            if len(obj.data.shape_keys.id_data.animation_data.drivers) > 0:
+            num_toggled_before = num_toggled
+            drivers = animation_data.drivers
+            if self.action == "TOGGLE":
+                for driver in drivers:
+                    driver.mute = not driver.mute
+                num_toggled += len(drivers)
+            else:
+                # only write the drivers that are not muted/unmuted yet
+                mute = self.action == "MUTE"
+                for driver in drivers:
+                    if driver.mute != mute:
+                        driver.mute = mute
+                        num_toggled += 1
+
+            # only count objects that had at least one driver changed
+            if num_toggled > num_toggled_before:
                 num_toggled_obj += 1
-            for driver in obj.data.shape_keys.id_data.animation_data.drivers:
-                if driver is not None:
-                    num_toggled += 1
-                    if self.action == "TOGGLE":
-                        driver.mute = not driver.mute
-                    if self.action == "MUTE":
-                        driver.mute = True
-                    if self.action == "UNMUTE":
-                        driver.mute = False
 
         if self.action == "TOGGLE":
             action_word = "Toggled"
@@ -506,6 +709,7 @@ class SK_OT_toggle_shapekeys_drivers(Operator):
 
 
 classes = (
+    SK_PG_bake_shapekey_animation,
     SK_OT_apply_mods,
     SK_OT_bake_shapekey_animation,
     SK_OT_toggle_shapekeys_drivers,
@@ -529,11 +733,17 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    bpy.types.Scene.sk_bake = bpy.props.PointerProperty(
+        type=SK_PG_bake_shapekey_animation
+    )
+
     bpy.types.VIEW3D_MT_object_apply.append(modifier_panel)
     bpy.types.VIEW3D_MT_object_animation.append(animation_panel)
 
 
 def unregister():
+    del bpy.types.Scene.sk_bake
+
     for cls in classes:
         bpy.utils.unregister_class(cls)
 